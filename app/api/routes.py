@@ -1,273 +1,363 @@
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
 from app.api.schemas import gateway_cmd as gw_cmd_schemas
 from app.api.schemas import sensor_cmd as s_cmd_schemas
 from app.api.schemas import sensor_resp as s_resp_schemas
-from app.api.utils import GatewayAPIHandler, store_response_in_redis, retrieve_response_from_redis
-from app.core.config import REDIS_HOST, REDIS_PORT, REDIS_DB
+from app.api.utils import get_gateway_handler, get_redis, store_response_in_redis, retrieve_responses_from_redis
 
-import redis
+import asyncio
+import orjson
+import redis.asyncio as aioredis
 
-router = APIRouter()
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
-
-# --- Edge Gateway Commands ---
-@router.post("/gateway/command/get/available-sensors", tags=["Edge Gateway Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def get_available_sensors(command: gw_cmd_schemas.GetAvailableSensors):
-    """
-    GET Available Sensors Command
+from typing import get_type_hints
 
-    This command makes the gateway perform a BLE scan to discover the edge sensors available for provisioning.
-    The results of the scan will be sent from the Gateway API on a separate endpoint once the scan is complete.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/gateway/command/get/available-sensors", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_200_OK:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return [
-        gw_cmd_schemas.BLEDevice(**device) for device in cmd_response.json()
-    ]
-
-@router.post("/gateway/command/get/provisioned-sensors", tags=["Edge Gateway Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def get_provisioned_sensors(command: gw_cmd_schemas.GetProvisionedSensors):
-    """
-    GET Provisioned Sensors Command
+router = APIRouter()
 
-    This command makes the gateway retrieve the edge sensors that have been provisioned.
-    The results of the provisioning will be sent from the Gateway API on a separate endpoint once the retrieval is complete.
-    """
+# --- Command Response Parsers ---
+# Each parser receives the response bodies of every target Gateway API
+_BLE_DEVICES = TypeAdapter(list[gw_cmd_schemas.BLEDevice])
 
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/gateway/command/get/provisioned-sensors", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_200_OK:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
+def _parse_ble_list(bodies: list[bytes]):
     return [
-        gw_cmd_schemas.BLEDevice(**device) for device in cmd_response.json()
+        device for body in bodies for device in _BLE_DEVICES.validate_json(body)
     ]
 
+def _message(message: str):
+    def parser(bodies: list[bytes]):
+        return {
+            "message": message,
+        }
+    return parser
 
-@router.post("/gateway/command/add/provisioned-sensors", tags=["Edge Gateway Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def add_provisioned_sensors(command: gw_cmd_schemas.AddProvisionedSensors):
-    """
-    ADD Provisioned Sensors Command
-
-    This command makes the gateway provision the edge sensors that were discovered during the BLE scan.
-    The results of the provisioning will be sent to the gateway's metadata microservice for storage.
-    The cloud can poll the metadata microservice to get the updated list of provisioned sensors.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/gateway/command/add/provisioned-sensors", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_200_OK:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "ADD Provisioned Sensors Command Sent to Gateway API",
-    }
-
-@router.post("/gateway/command/add/registered-sensors", tags=["Edge Gateway Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def add_registered_sensors(command: gw_cmd_schemas.AddRegisteredSensors):
-    """
-    ADD Registered Sensors Command
-
-    This command makes the gateway register the edge sensors that were provisioned.
-    The results of the registration will be sent to the gateway's metadata microservice for storage.
-    The cloud can poll the metadata microservice to get the updated list of registered sensors.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/gateway/command/add/registered-sensors", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_200_OK:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "ADD Registered Sensors Command Sent to Gateway API",
-    }
-
-
-@router.post("/gateway/command/set/gateway-model", tags=["Edge Gateway Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def set_gateway_model(command: gw_cmd_schemas.SetGatewayModel):
-    """
-    SET Gateway Model Command
+def _message_with_uuids(message: str):
+    def parser(bodies: list[bytes]):
+        return {
+            "message": message,
+            "command_uuids": [
+                command_uuid for body in bodies for command_uuid in orjson.loads(body).get("command_uuids") or []
+            ]
+        }
+    return parser
 
-    This command makes the gateway upload a Machine Learning model to the gateway.
-    The model will be stored in the gateway's filesystem and can be used for inference.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/gateway/command/set/gateway-model", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "SET Gateway Model Command Sent to Gateway API",
-    }
 
+# --- Edge Gateway Commands ---
+# (endpoint, route name, command schema, expected gateway status, response parser, docstring)
+GATEWAY_COMMANDS = [
+    (
+        "/gateway/command/get/available-sensors",
+        "get_available_sensors",
+        gw_cmd_schemas.GetAvailableSensors,
+        status.HTTP_200_OK,
+        _parse_ble_list,
+        """
+        GET Available Sensors Command
+
+        This command makes the gateway perform a BLE scan to discover the edge sensors available for provisioning.
+        The results of the scan will be sent from the Gateway API on a separate endpoint once the scan is complete.
+        """,
+    ),
+    (
+        "/gateway/command/get/provisioned-sensors",
+        "get_provisioned_sensors",
+        gw_cmd_schemas.GetProvisionedSensors,
+        status.HTTP_200_OK,
+        _parse_ble_list,
+        """
+        GET Provisioned Sensors Command
+
+        This command makes the gateway retrieve the edge sensors that have been provisioned.
+        The results of the provisioning will be sent from the Gateway API on a separate endpoint once the retrieval is complete.
+        """,
+    ),
+    (
+        "/gateway/command/add/provisioned-sensors",
+        "add_provisioned_sensors",
+        gw_cmd_schemas.AddProvisionedSensors,
+        status.HTTP_200_OK,
+        _message("ADD Provisioned Sensors Command Sent to Gateway API"),
+        """
+        ADD Provisioned Sensors Command
+
+        This command makes the gateway provision the edge sensors that were discovered during the BLE scan.
+        The results of the provisioning will be sent to the gateway's metadata microservice for storage.
+        The cloud can poll the metadata microservice to get the updated list of provisioned sensors.
+        """,
+    ),
+    (
+        "/gateway/command/add/registered-sensors",
+        "add_registered_sensors",
+        gw_cmd_schemas.AddRegisteredSensors,
+        status.HTTP_200_OK,
+        _message("ADD Registered Sensors Command Sent to Gateway API"),
+        """
+        ADD Registered Sensors Command
+
+        This command makes the gateway register the edge sensors that were provisioned.
+        The results of the registration will be sent to the gateway's metadata microservice for storage.
+        The cloud can poll the metadata microservice to get the updated list of registered sensors.
+        """,
+    ),
+    (
+        "/gateway/command/set/gateway-model",
+        "set_gateway_model",
+        gw_cmd_schemas.SetGatewayModel,
+        status.HTTP_202_ACCEPTED,
+        _message("SET Gateway Model Command Sent to Gateway API"),
+        """
+        SET Gateway Model Command
+
+        This command makes the gateway upload a Machine Learning model to the gateway.
+        The model will be stored in the gateway's filesystem and can be used for inference.
+        """,
+    ),
+]
 
 # --- Edge Sensor Commands ---
-@router.post("/sensor/command/set/sensor-state", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def set_sensor_state(command: s_cmd_schemas.SetSensorState):
-    """
-    SET Sensor State Command
-
-    This command makes the sensor change it's state to either active or inactive.
-    The sensor will only collect data and perform inference when it is in the active state.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/set/sensor-state", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "SET Sensor State Command Sent to Gateway API",
-    }
-
-@router.post("/sensor/command/get/sensor-state", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def command_get_sensor_state(command: s_cmd_schemas.GetSensorState):
-    """
-    GET Sensor State Command
-
-    This command makes the sensor retrieve it's current state.
-    The sensor will only collect data and perform inference when it is in the active state.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/get/sensor-state", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    command_uuids = cmd_response.json().get("command_uuids")
-
-    return {
-        "message": "GET Sensor State Command Sent to Gateway API",
-        "command_uuids": command_uuids
-    }
-
-@router.post("/sensor/command/set/inference-layer", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def set_inference_layer(command: s_cmd_schemas.SetInferenceLayer):
-    """
-    SET Inference Layer Command
-
-    This command makes the sensor switch it's inference layer to either the sensor, gateway or cloud.
-    The sensor will perform inference on the selected layer.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/set/inference-layer", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "SET Inference Layer Command Sent to Gateway API",
-    }
-
-@router.post("/sensor/command/get/inference-layer", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def command_get_inference_layer(command: s_cmd_schemas.GetInferenceLayer):
-    """
-    GET Inference Layer Command
-
-    This command makes the sensor retrieve it's current inference layer.
-    The sensor will perform inference on the selected layer.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/get/inference-layer", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    command_uuids = cmd_response.json().get("command_uuids")
-
-    return {
-        "message": "GET Inference Layer Command Sent to Gateway API",
-        "command_uuids": command_uuids
-    }
-
-@router.post("/sensor/command/set/sensor-config", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def set_sensor_config(command: s_cmd_schemas.SetSensorConfig):
-    """
-    SET Sensor Configuration Command
-
-    This command makes the sensor update it's configuration.
-    The sensor will use the new configuration for data collection and inference.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/set/sensor-config", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "SET Sensor Configuration Command Sent to Gateway API",
-    }
-
-@router.post("/sensor/command/get/sensor-config", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def command_get_sensor_config(command: s_cmd_schemas.GetSensorConfig):
-    """
-    GET Sensor Configuration Command
-
-    This command makes the sensor retrieve it's current configuration.
-    The sensor will use the configuration for data collection and inference.
-    """
-
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/get/sensor-config", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    command_uuids = cmd_response.json().get("command_uuids")
+SENSOR_COMMANDS = [
+    (
+        "/sensor/command/set/sensor-state",
+        "set_sensor_state",
+        s_cmd_schemas.SetSensorState,
+        status.HTTP_202_ACCEPTED,
+        _message("SET Sensor State Command Sent to Gateway API"),
+        """
+        SET Sensor State Command
+
+        This command makes the sensor change it's state to either active or inactive.
+        The sensor will only collect data and perform inference when it is in the active state.
+        """,
+    ),
+    (
+        "/sensor/command/get/sensor-state",
+        "command_get_sensor_state",
+        s_cmd_schemas.GetSensorState,
+        status.HTTP_202_ACCEPTED,
+        _message_with_uuids("GET Sensor State Command Sent to Gateway API"),
+        """
+        GET Sensor State Command
+
+        This command makes the sensor retrieve it's current state.
+        The sensor will only collect data and perform inference when it is in the active state.
+        """,
+    ),
+    (
+        "/sensor/command/set/inference-layer",
+        "set_inference_layer",
+        s_cmd_schemas.SetInferenceLayer,
+        status.HTTP_202_ACCEPTED,
+        _message("SET Inference Layer Command Sent to Gateway API"),
+        """
+        SET Inference Layer Command
+
+        This command makes the sensor switch it's inference layer to either the sensor, gateway or cloud.
+        The sensor will perform inference on the selected layer.
+        """,
+    ),
+    (
+        "/sensor/command/get/inference-layer",
+        "command_get_inference_layer",
+        s_cmd_schemas.GetInferenceLayer,
+        status.HTTP_202_ACCEPTED,
+        _message_with_uuids("GET Inference Layer Command Sent to Gateway API"),
+        """
+        GET Inference Layer Command
+
+        This command makes the sensor retrieve it's current inference layer.
+        The sensor will perform inference on the selected layer.
+        """,
+    ),
+    (
+        "/sensor/command/set/sensor-config",
+        "set_sensor_config",
+        s_cmd_schemas.SetSensorConfig,
+        status.HTTP_202_ACCEPTED,
+        _message("SET Sensor Configuration Command Sent to Gateway API"),
+        """
+        SET Sensor Configuration Command
+
+        This command makes the sensor update it's configuration.
+        The sensor will use the new configuration for data collection and inference.
+        """,
+    ),
+    (
+        "/sensor/command/get/sensor-config",
+        "command_get_sensor_config",
+        s_cmd_schemas.GetSensorConfig,
+        status.HTTP_202_ACCEPTED,
+        _message_with_uuids("GET Sensor Configuration Command Sent to Gateway API"),
+        """
+        GET Sensor Configuration Command
+
+        This command makes the sensor retrieve it's current configuration.
+        The sensor will use the configuration for data collection and inference.
+        """,
+    ),
+    (
+        "/sensor/command/set/sensor-model",
+        "set_sensor_model",
+        s_cmd_schemas.SetSensorModel,
+        status.HTTP_202_ACCEPTED,
+        _message("SET Sensor Model Command Sent to Gateway API"),
+        """
+        SET Sensor Model Command
+
+        This command makes the sensor upload a Machine Learning model to the sensor.
+        The model will be stored in the sensor's filesystem and can be used for inference.
+        """,
+    ),
+    (
+        "/sensor/command/set/inf-latency-bench",
+        "set_inf_latency_bench",
+        s_cmd_schemas.InferenceLatencyBenchmarkCommand,
+        status.HTTP_202_ACCEPTED,
+        _message("SET Inference Latency Benchmark Command Sent to Gateway API"),
+        """
+        EXPERIMENTAL: SET Inference Latency Benchmark Command
+
+        This command is for benchmarking the inference latency of the sensor.
+        The command contains the reading UUID and the timestamp when the reading was sent.
+        The sensor publishes an EXPORT once the command is received. The EXPORT contains
+        the timestamp when the command was received and the latency calculated as the difference
+        between the current timestamp and the timestamp in the command.
+        """,
+    ),
+]
+
+class CommandRoute(APIRoute):
+    """
+    Route for the command endpoints, documented from their `command` parameter like any other route.
+
+    The request body is validated straight from JSON bytes with `model_validate_json` instead of
+    FastAPI's dict-based parsing. The handler only supports endpoints taking `request` and `command`:
+    dependencies, background tasks and a response_model would be silently ignored, so they are rejected
+    when the route is registered.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        assert not self.dependant.dependencies, f"{self.name}: CommandRoute does not resolve dependencies"
+        assert self.dependant.background_tasks_param_name is None, f"{self.name}: CommandRoute does not run background tasks"
+        assert self.response_model is None, f"{self.name}: CommandRoute does not apply a response_model"
+
+    def get_route_handler(self):
+        command_schema = get_type_hints(self.endpoint)["command"]
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+
+        async def handler(request: Request) -> Response:
+            json_bytes = await request.body()
+            try:
+                # Like FastAPI, a body is read as JSON when no other media type is declared
+                content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+                if content_type == "application/json" or content_type.endswith("+json"):
+                    command = command_schema.model_validate_json(json_bytes)
+                else:
+                    command = command_schema.model_validate(json_bytes)
+            except ValidationError as e:
+                raise RequestValidationError(
+                    [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+                    body=json_bytes
+                )
+
+            content = await self.endpoint(request=request, command=command)
+            return response_class(jsonable_encoder(content), status_code=self.status_code)
+
+        return handler
+
+def _ensure_status(status_code: int, body: bytes, expected_status: int):
+    """
+    Raise the Gateway API error as an HTTPException when it did not answer with the expected status.
+    """
+    if status_code != expected_status:
+        raise HTTPException(status_code=status_code, detail=orjson.loads(body))
+
+def _command_for_target(command, url: str) -> bytes:
+    """
+    Encode the command as sent to one target Gateway API, naming that gateway in `target.url`.
+    """
+    if command.target.url != url:
+        command = command.model_copy(update={"target": command.target.model_copy(update={"url": url})})
+    return command.model_dump_json().encode()
+
+def make_route(endpoint: str, name: str, command_schema: type, expected_status: int, parser, docstring: str):
+    """
+    Build a route that forwards a command to every target Gateway API on the same endpoint.
+    """
+
+    async def route(request: Request, command: command_schema):
+        # Commands are always re-encoded so the gateway gets defaults filled in and unknown fields dropped,
+        # whatever the client sent
+        results = await asyncio.gather(
+            *(
+                get_gateway_handler(request, url).post_raw_json(
+                    endpoint=endpoint,
+                    json_bytes=_command_for_target(command, url)
+                )
+                for url in command.target.all_urls
+            ),
+            return_exceptions=True
+        )
 
-    return {
-        "message": "GET Sensor Configuration Command Sent to Gateway API",
-        "command_uuids": command_uuids
-    }
+        if len(results) == 1:
+            # Single target: surface the gateway error as is
+            if isinstance(results[0], BaseException):
+                raise results[0]
+            _ensure_status(*results[0], expected_status)
+        elif any(isinstance(result, BaseException) or result[0] != expected_status for result in results):
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=[
+                    {"url": url, "status_code": None if isinstance(result, BaseException) else result[0]}
+                    for url, result in zip(command.target.all_urls, results)
+                ]
+            )
+
+        return parser([body for _, body in results])
+
+    route.__name__ = name
+    route.__doc__ = docstring
+    return route
+
+for tag, commands in (("Edge Gateway Commands", GATEWAY_COMMANDS), ("Edge Sensor Commands", SENSOR_COMMANDS)):
+    for endpoint, name, command_schema, expected_status, parser, docstring in commands:
+        router.add_api_route(
+            endpoint,
+            make_route(endpoint, name, command_schema, expected_status, parser, docstring),
+            methods=["POST"],
+            name=name,
+            route_class_override=CommandRoute,
+            tags=[tag],
+            status_code=status.HTTP_202_ACCEPTED,
+        )
 
-@router.post("/sensor/command/set/sensor-model", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def set_sensor_model(command: s_cmd_schemas.SetSensorModel):
-    """
-    SET Sensor Model Command
 
-    This command makes the sensor upload a Machine Learning model to the sensor.
-    The model will be stored in the sensor's filesystem and can be used for inference.
-    """
+# --- Sensor Command Responses ---
+# Validators for the JSON arrays read back from the cache database, built once at import
+_SENSOR_STATE_RESPONSES = TypeAdapter(list[s_resp_schemas.SensorStateResponse])
+_INFERENCE_LAYER_RESPONSES = TypeAdapter(list[s_resp_schemas.InferenceLayerResponse])
+_SENSOR_CONFIG_RESPONSES = TypeAdapter(list[s_resp_schemas.SensorConfigResponse])
 
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/set/sensor-model", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "SET Sensor Model Command Sent to Gateway API",
-    }
+# Retrieved responses are deleted from the cache database, a reverse proxy may briefly replay them to retries
+_RETRIEVE_CACHE_CONTROL = "max-age=1"
 
-@router.post("/sensor/command/set/inf-latency-bench", tags=["Edge Sensor Commands"], status_code=status.HTTP_202_ACCEPTED)
-async def set_inf_latency_bench(command: s_cmd_schemas.InferenceLatencyBenchmarkCommand):
+def _retrieved_responses(adapter: TypeAdapter, responses: bytes) -> Response:
     """
-    EXPERIMENTAL: SET Inference Latency Benchmark Command
-
-    This command is for benchmarking the inference latency of the sensor.
-    The command contains the reading UUID and the timestamp when the reading was sent.
-    The sensor publishes an EXPORT once the command is received. The EXPORT contains
-    the timestamp when the command was received and the latency calculated as the difference
-    between the current timestamp and the timestamp in the command.
+    Validate the retrieved JSON array and serialize it back in one pass, bypassing the response_model round-trip.
     """
+    return Response(
+        content=adapter.dump_json(adapter.validate_json(responses)),
+        media_type="application/json",
+        headers={"Cache-Control": _RETRIEVE_CACHE_CONTROL}
+    )
 
-    api_handler = GatewayAPIHandler(url=command.target.url)
-    cmd_response = await api_handler.post_json(endpoint="/sensor/command/set/inf-latency-bench", data=command.model_dump())
-    if cmd_response.status_code != status.HTTP_202_ACCEPTED:
-        raise HTTPException(status_code=cmd_response.status_code, detail=cmd_response.json())
-    
-    return {
-        "message": "SET Inference Latency Benchmark Command Sent to Gateway API",
-    }
-
-
-# --- Sensor Command Responses ---
 @router.post("/store/sensor/response/get/sensor-state", tags=["Sensor Command Responses"], status_code=status.HTTP_201_CREATED)
-async def store_get_sensor_state_response(response: s_resp_schemas.SensorStateResponse):
+async def store_get_sensor_state_response(response: s_resp_schemas.SensorStateResponse, redis_client: aioredis.Redis = Depends(get_redis)):
     """
     STORE Sensor State Command Response
 
@@ -277,38 +367,33 @@ async def store_get_sensor_state_response(response: s_resp_schemas.SensorStateRe
     # Retrieve the sensor name from the response
     command_uuid = response.metadata.command_uuid
 
-    store_response_in_redis(
+    await store_response_in_redis(
         redis_client=redis_client,
         command_uuid=command_uuid,
-        response=response.model_dump()
+        response=response.model_dump_json().encode()
     )
 
     return {
         "message": "GET Sensor State Command Response Stored in Cache Database"
     }
 
-@router.post("/retrieve/sensor/response/get/sensor-state", tags=["Sensor Command Responses"], status_code=status.HTTP_200_OK)
-async def retrieve_get_sensor_state_response(command_uuids: list[str]) -> list[s_resp_schemas.SensorStateResponse]:
+@router.get("/retrieve/sensor/response/get/sensor-state", tags=["Sensor Command Responses"], status_code=status.HTTP_200_OK, response_model=list[s_resp_schemas.SensorStateResponse])
+async def retrieve_get_sensor_state_response(command_uuids: list[str] = Query(...), redis_client: aioredis.Redis = Depends(get_redis)):
     """
     RETRIEVE Sensor State Command Response
 
     This endpoint is used to retrieve the response of a GET Sensor State Command from the cache database.
     """
 
-    responses = []
-    for command_uuid in command_uuids:
-        response = retrieve_response_from_redis(
-            redis_client=redis_client,
-            command_uuid=command_uuid
-        )
-        if response is None:
-            continue
-        responses.append(s_resp_schemas.SensorStateResponse(**response))
+    responses = await retrieve_responses_from_redis(
+        redis_client=redis_client,
+        command_uuids=command_uuids
+    )
 
-    return responses
+    return _retrieved_responses(_SENSOR_STATE_RESPONSES, responses)
 
 @router.post("/store/sensor/response/get/inference-layer", tags=["Sensor Command Responses"], status_code=status.HTTP_201_CREATED)
-async def store_get_inference_layer_response(response: s_resp_schemas.InferenceLayerResponse):
+async def store_get_inference_layer_response(response: s_resp_schemas.InferenceLayerResponse, redis_client: aioredis.Redis = Depends(get_redis)):
     """
     STORE Inference Layer Command Response
 
@@ -318,38 +403,33 @@ async def store_get_inference_layer_response(response: s_resp_schemas.InferenceL
     # Retrieve the sensor name from the response
     command_uuid = response.metadata.command_uuid
 
-    store_response_in_redis(
+    await store_response_in_redis(
         redis_client=redis_client,
         command_uuid=command_uuid,
-        response=response.model_dump()
+        response=response.model_dump_json().encode()
     )
 
     return {
         "message": "GET Inference Layer Command Response Stored in Cache Database"
     }
 
-@router.post("/retrieve/sensor/response/get/inference-layer", tags=["Sensor Command Responses"], status_code=status.HTTP_200_OK)
-async def retrieve_get_inference_layer_response(command_uuids: list[str]) -> list[s_resp_schemas.InferenceLayerResponse]:
+@router.get("/retrieve/sensor/response/get/inference-layer", tags=["Sensor Command Responses"], status_code=status.HTTP_200_OK, response_model=list[s_resp_schemas.InferenceLayerResponse])
+async def retrieve_get_inference_layer_response(command_uuids: list[str] = Query(...), redis_client: aioredis.Redis = Depends(get_redis)):
     """
     RETRIEVE Inference Layer Command Response
 
     This endpoint is used to retrieve the response of a GET Inference Layer Command from the cache database.
     """
 
-    responses = []
-    for command_uuid in command_uuids:
-        response = retrieve_response_from_redis(
-            redis_client=redis_client,
-            command_uuid=command_uuid
-        )
-        if response is None:
-            continue
-        responses.append(s_resp_schemas.InferenceLayerResponse(**response))
+    responses = await retrieve_responses_from_redis(
+        redis_client=redis_client,
+        command_uuids=command_uuids
+    )
 
-    return responses
+    return _retrieved_responses(_INFERENCE_LAYER_RESPONSES, responses)
 
 @router.post("/store/sensor/response/get/sensor-config", tags=["Sensor Command Responses"], status_code=status.HTTP_201_CREATED)
-async def store_get_sensor_config_response(response: s_resp_schemas.SensorConfigResponse):
+async def store_get_sensor_config_response(response: s_resp_schemas.SensorConfigResponse, redis_client: aioredis.Redis = Depends(get_redis)):
     """
     STORE Sensor Configuration Command Response
 
@@ -359,32 +439,27 @@ async def store_get_sensor_config_response(response: s_resp_schemas.SensorConfig
     # Retrieve the sensor name from the response
     command_uuid = response.metadata.command_uuid
 
-    store_response_in_redis(
+    await store_response_in_redis(
         redis_client=redis_client,
         command_uuid=command_uuid,
-        response=response.model_dump()
+        response=response.model_dump_json().encode()
     )
 
     return {
         "message": "GET Sensor Configuration Command Response Stored in Cache Database"
     }
 
-@router.post("/retrieve/sensor/response/get/sensor-config", tags=["Sensor Command Responses"], status_code=status.HTTP_200_OK)
-async def retrieve_get_sensor_config_response(command_uuids: list[str]) -> list[s_resp_schemas.SensorConfigResponse]:
+@router.get("/retrieve/sensor/response/get/sensor-config", tags=["Sensor Command Responses"], status_code=status.HTTP_200_OK, response_model=list[s_resp_schemas.SensorConfigResponse])
+async def retrieve_get_sensor_config_response(command_uuids: list[str] = Query(...), redis_client: aioredis.Redis = Depends(get_redis)):
     """
     RETRIEVE Sensor Configuration Command Response
 
     This endpoint is used to retrieve the response of a GET Sensor Configuration Command from the cache database.
     """
 
-    responses = []
-    for command_uuid in command_uuids:
-        response = retrieve_response_from_redis(
-            redis_client=redis_client,
-            command_uuid=command_uuid
-        )
-        if response is None:
-            continue
-        responses.append(s_resp_schemas.SensorConfigResponse(**response))
+    responses = await retrieve_responses_from_redis(
+        redis_client=redis_client,
+        command_uuids=command_uuids
+    )
 
-    return responses
+    return _retrieved_responses(_SENSOR_CONFIG_RESPONSES, responses)
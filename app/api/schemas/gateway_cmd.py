@@ -1,7 +1,7 @@
 """ Edge Gateway Commands """
 
 import enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional
 
 class Method(str, enum.Enum):
@@ -12,12 +12,33 @@ class Method(str, enum.Enum):
 class GatewayAPI(BaseModel):
     """
     Schema for the Gateway API
+
+    A command targets a single `url` or fans out to a list of `urls`, never both.
+    Each Gateway API receives the command with its own url as `url`, `urls` is never forwarded.
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     gateway_name: str
-    url: str
+    url: Optional[str] = None
+    urls: list[str] = Field(default=[], exclude=True)
+
+    @model_validator(mode="after")
+    def check_url(self):
+        if (self.url is None) == (not self.urls):
+            raise ValueError("exactly one of url or urls must be given")
+        return self
+
+    @property
+    def all_urls(self) -> list[str]:
+        """
+        Gateway APIs the command is sent to.
+        """
+        return self.urls or [self.url]
 
 class BaseCommand(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     method: Method
     target: GatewayAPI
     property_name: Optional[str] = None
@@ -29,6 +50,8 @@ class GatewayModel(BaseModel):
     Schema for the Gateway Model
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     tf_model_bytesize: int
     tf_model_b64: str
 
@@ -45,6 +68,8 @@ class BLEDevice(BaseModel):
     Schema for the BLE Device
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     device_name: str
     device_address: str
 
@@ -87,6 +112,8 @@ class SensorDescriptor(BaseModel):
     Schema for the Sensor Descriptor
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     device_name: str
     device_address: str
 
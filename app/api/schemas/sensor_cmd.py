@@ -1,23 +1,24 @@
 """ Edge Sensor Commands """
 
 import enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from app.api.schemas.gateway_cmd import GatewayAPI
 from typing import Optional
 
 class Method(str, enum.Enum):
     GET = "get"
     SET = "set"
 
-class GatewayAPIWithSensors(BaseModel):
+class GatewayAPIWithSensors(GatewayAPI):
     """
     Schema for the Gateway API
     """
 
-    gateway_name: str
-    url: str
     target_sensors: list[str]
 
 class BaseCommand(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     method: Method
     target: GatewayAPIWithSensors
     property_name: Optional[str] = None
@@ -66,6 +67,8 @@ class GetInferenceLayer(InferenceLayerCommand):
 # --- Property: Sensor Config ---
 
 class SensorConfig(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     sleep_interval_ms: int
 
 class SensorConfigCommand(BaseCommand):
@@ -85,6 +88,8 @@ class SensorModel(BaseModel):
     Schema for the Sensor Model
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     tf_model_b64: str
     tf_model_bytesize: int
 
@@ -99,6 +104,8 @@ class SetSensorModel(SensorModelCommand):
 # --- Property: Inference Latency Benchmark ---
 
 class InferenceLatencyBenchmark(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     sensor_name: str
     inference_layer: InferenceLayer
     send_timestamp: Optional[int] = None
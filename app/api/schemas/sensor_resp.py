@@ -9,7 +9,7 @@ This module contains the response schemas for the Sensor Commands which fall und
 mentioned above.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.api.schemas.sensor_cmd import SensorConfig, InferenceLayer, SensorState, Method
 from typing import Optional
 
@@ -18,11 +18,15 @@ class Metadata(BaseModel):
     Metadata for the response
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     sender: str
     command_uuid: str
     gateway_name: str
 
 class BaseResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     metadata: Metadata
     property_name: Optional[str] = None
     property_value: object = None
@@ -1,35 +1,155 @@
+import asyncio
 import httpx
-import json
-import redis
+import time
+import redis.asyncio as aioredis
+import zstandard as zstd
+
+from app.core.config import RESPONSE_TTL_SECONDS
+from app.core.metrics import GATEWAY_RPC_SECONDS, REDIS_OP_SECONDS, CACHE_EVENTS
+
+from fastapi import Request
 
 # --- Gateway API ---
 
+def get_redis(request: Request) -> aioredis.Redis:
+    """
+    Dependency returning the application-scoped Redis client created in the lifespan.
+    """
+    return request.app.state.redis
+
 class GatewayAPIHandler:
-    def __init__ (self, url: str):
-        self.url = url
+    def __init__ (self, client: httpx.AsyncClient, url: str):
+        self.client = client
+        # Parsed once so requests only swap in the endpoint path
+        self.url = httpx.URL(url)
+        self.base_path = self.url.path.rstrip("/")
 
-    async def get(self, endpoint: str):
-        async with httpx.AsyncClient(timeout=httpx.Timeout(20.0)) as client:
-            response = await client.get(
-                f"{self.url}{endpoint}",
-            )
-            return response
-    
-    async def post_json(self, endpoint: str, data: dict):
-        async with httpx.AsyncClient(timeout=httpx.Timeout(20.0)) as client:
-            response = await client.post(
-                f"{self.url}{endpoint}",
-                json=data
+    def endpoint_url(self, endpoint: str) -> httpx.URL:
+        return self.url.copy_with(path=f"{self.base_path}{endpoint}")
+
+    async def post_raw_json(self, endpoint: str, json_bytes: bytes) -> tuple[int, bytes]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.post(
+                self.endpoint_url(endpoint),
+                content=json_bytes,
+                headers={"content-type": "application/json"}
             )
-            return response
+        except httpx.HTTPError:
+            GATEWAY_RPC_SECONDS.labels(endpoint, "error").observe(time.perf_counter() - start)
+            raise
+        GATEWAY_RPC_SECONDS.labels(endpoint, str(response.status_code)).observe(time.perf_counter() - start)
+        return response.status_code, response.content
+
+def get_gateway_handler(request: Request, url: str) -> GatewayAPIHandler:
+    """
+    Return the handler for a Gateway API url, reusing the one cached in the lifespan.
+    """
+    handlers = request.app.state.gateway_handlers
+    handler = handlers.get(url)
+    if handler is None:
+        handler = handlers[url] = GatewayAPIHandler(client=request.app.state.http_client, url=url)
+    return handler
     
 # --- Command Responses ---
-def store_response_in_redis(redis_client: redis.Redis, command_uuid: str, response: dict):
-    redis_client.set(command_uuid, json.dumps(response))
-
-def retrieve_response_from_redis(redis_client: redis.Redis, command_uuid: str):
-    response = redis_client.get(command_uuid)
-    if response:
-        redis_client.delete(command_uuid)
-        return json.loads(response)
-    return None
\ No newline at end of file
+# Retrievals currently waiting on Redis, by command UUID
+_inflight: dict[str, asyncio.Future] = {}
+# Strong references to the lookup tasks behind _inflight until they finish
+_inflight_tasks: set[asyncio.Task] = set()
+
+# Responses above the threshold are stored zstd-compressed behind a b"z" prefix,
+# smaller ones are stored as plain JSON (which never starts with "z")
+_COMPRESSION_THRESHOLD = 1024
+_COMPRESSED_PREFIX = b"z"
+_zstd_compressor = zstd.ZstdCompressor(level=3)
+_zstd_decompressor = zstd.ZstdDecompressor()
+
+def _compress(response: bytes) -> bytes:
+    if len(response) < _COMPRESSION_THRESHOLD:
+        return response
+    return _COMPRESSED_PREFIX + _zstd_compressor.compress(response)
+
+def _decompress(response: bytes) -> bytes:
+    if response[:1] == _COMPRESSED_PREFIX:
+        return _zstd_decompressor.decompress(response[1:])
+    return response
+
+async def store_response_in_redis(redis_client: aioredis.Redis, command_uuid: str, response: bytes):
+    """
+    Store a response until it is retrieved, for at most RESPONSE_TTL_SECONDS.
+    """
+    with REDIS_OP_SECONDS.labels("set").time():
+        await redis_client.set(command_uuid, _compress(response), ex=RESPONSE_TTL_SECONDS)
+
+async def _fetch_and_delete(redis_client: aioredis.Redis, command_uuids: list[str]) -> list[bytes | None]:
+    # The MGET and every DELETE share one pipelined round-trip. A response is only returned
+    # if this lookup's DELETE removed the key, so it is never handed out by two lookups,
+    # even when another worker fetches it between the MGET and the DELETE.
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.mget(command_uuids)
+    for command_uuid in command_uuids:
+        pipe.delete(command_uuid)
+    with REDIS_OP_SECONDS.labels("retrieve").time():
+        fetched, *deleted = await pipe.execute()
+
+    responses = [
+        _decompress(response) if response and was_deleted else None
+        for response, was_deleted in zip(fetched, deleted)
+    ]
+    hits = sum(1 for response in responses if response)
+    CACHE_EVENTS.labels("redis", "hit").inc(hits)
+    CACHE_EVENTS.labels("redis", "miss").inc(len(command_uuids) - hits)
+    return responses
+
+async def _resolve_inflight(redis_client: aioredis.Redis, owned: dict[str, asyncio.Future]):
+    try:
+        fetched = await _fetch_and_delete(redis_client, list(owned))
+    except asyncio.CancelledError:
+        # Only happens when the event loop shuts down
+        for future in owned.values():
+            future.cancel()
+        raise
+    except Exception as e:
+        for future in owned.values():
+            future.set_exception(e)
+            # Mark the exception as retrieved in case every waiter was cancelled meanwhile
+            future.exception()
+    else:
+        for future, response in zip(owned.values(), fetched):
+            future.set_result(response)
+    finally:
+        for command_uuid in owned:
+            del _inflight[command_uuid]
+
+async def retrieve_responses_from_redis(redis_client: aioredis.Redis, command_uuids: list[str]) -> bytes:
+    """
+    Fetch and delete the stored responses, returned as a single JSON array of the responses found.
+
+    Each stored response is handed out by exactly one Redis lookup, which deletes it. Every retrieval
+    of that command UUID in flight in this worker shares that lookup and gets the response. Later
+    retrievals, and concurrent ones in other workers, do not get it. A UUID repeated within one
+    retrieval is returned once.
+    """
+    if not command_uuids:
+        return b"[]"
+
+    # Repeated UUIDs are only looked up and returned once
+    command_uuids = list(dict.fromkeys(command_uuids))
+
+    # Register a future for every UUID not already being fetched by another request
+    loop = asyncio.get_running_loop()
+    owned = {}
+    for command_uuid in command_uuids:
+        if command_uuid not in _inflight:
+            owned[command_uuid] = _inflight[command_uuid] = loop.create_future()
+    futures = [_inflight[command_uuid] for command_uuid in command_uuids]
+
+    if owned:
+        # The lookup runs in its own task so cancelling this request does not cancel it for the
+        # other requests waiting on the same UUIDs, each request only shields its own wait
+        task = asyncio.create_task(_resolve_inflight(redis_client, owned))
+        _inflight_tasks.add(task)
+        task.add_done_callback(_inflight_tasks.discard)
+
+    responses = [await asyncio.shield(future) for future in futures]
+    return b"[" + b",".join(response for response in responses if response) + b"]"
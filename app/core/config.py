@@ -9,6 +9,12 @@ SECRET_KEY: str = os.environ.get("SECRET_KEY")
 REDIS_HOST: str = os.environ.get("REDIS_HOST", "localhost")
 REDIS_PORT: int = int(os.environ.get("REDIS_PORT", 6379))
 REDIS_DB: int = int(os.environ.get("REDIS_DB", 0))
+REDIS_MAX_CONNECTIONS: int = int(os.environ.get("REDIS_MAX_CONNECTIONS", 128))
+
+# Stored command responses expire if they are not retrieved within this time
+RESPONSE_TTL_SECONDS: int = int(os.environ.get("RESPONSE_TTL_SECONDS", 300))
+if RESPONSE_TTL_SECONDS <= 0:
+    raise ValueError(f"RESPONSE_TTL_SECONDS must be greater than 0, got {RESPONSE_TTL_SECONDS}")
 
 CLOUD_API_URL: str = os.environ.get("CLOUD_API_URL")
 
@@ -0,0 +1,22 @@
+from prometheus_client import Counter, Histogram
+
+# Latency of the commands forwarded to the Gateway APIs, by endpoint and returned status
+GATEWAY_RPC_SECONDS = Histogram(
+    "gateway_rpc_seconds",
+    "Duration of requests forwarded to Gateway APIs",
+    ["endpoint", "status"],
+)
+
+# Latency of the cache database operations behind the command responses
+REDIS_OP_SECONDS = Histogram(
+    "redis_op_seconds",
+    "Duration of Redis operations on command responses",
+    ["op"],
+)
+
+# Hits and misses of the Redis lookups when retrieving command responses
+CACHE_EVENTS = Counter(
+    "cache_events",
+    "Command response cache lookups",
+    ["op", "result"],
+)
@@ -1,13 +1,61 @@
+import httpx
+import os
+import socket
+import redis.asyncio as aioredis
 import uvicorn
 
+from cachetools import LRUCache
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api.routes import router
-from app.core.config import SECRET_KEY, ORIGINS
+from app.core.config import SECRET_KEY, ORIGINS, REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_MAX_CONNECTIONS
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import multiprocess
+from prometheus_fastapi_instrumentator import Instrumentator
 from starlette.middleware.sessions import SessionMiddleware
 
+# --- Application lifespan ---
+# Probe idle Redis connections after 60s, the options are skipped where the platform lacks them
+_TCP_KEEPALIVE_OPTIONS = {
+    getattr(socket, option): value
+    for option, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, option)
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # A single HTTP client is shared by every request so that connections
+    # to the gateways are kept alive and pooled instead of reopened per command.
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(20.0),
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        http2=True,
+    )
+    # Gateway API handlers are cached per target url so the url is only parsed once
+    app.state.gateway_handlers = LRUCache(maxsize=1024)
+    # The async Redis client keeps the event loop free during cache round-trips.
+    # Requests wait for a free pooled connection instead of failing when the pool is exhausted,
+    # and TCP keepalive stops idle connections from being dropped between bursts.
+    redis_pool = aioredis.BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=REDIS_DB,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=2,
+        socket_keepalive=True,
+        socket_keepalive_options=_TCP_KEEPALIVE_OPTIONS,
+    )
+    app.state.redis = aioredis.Redis(connection_pool=redis_pool)
+    yield
+    await app.state.http_client.aclose()
+    await app.state.redis.aclose()
+    await redis_pool.disconnect()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
 # --- Init FastAPI app ---
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 app.add_middleware(
     CORSMiddleware,
@@ -17,3 +65,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.include_router(router, prefix="/api/v1")
+
+# --- Metrics ---
+# With several workers, PROMETHEUS_MULTIPROC_DIR must be set (see run_service.sh) so that
+# /metrics aggregates every worker instead of reporting whichever one answered the scrape
+Instrumentator().instrument(app).expose(app, include_in_schema=False)
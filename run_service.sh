@@ -3,5 +3,11 @@
 # Load the environment variables
 source .env
 
+# Aggregate Prometheus metrics across uvicorn workers (prometheus_client multiprocess mode),
+# the directory must be emptied before the workers start
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/esn-cloud-cmd-ms-metrics}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # Run the FastAPI application
-uvicorn app.main:app --host 0.0.0.0 --port $COMMAND_MICROSERVICE_PORT
\ No newline at end of file
+uvicorn app.main:app --host 0.0.0.0 --port $COMMAND_MICROSERVICE_PORT --loop uvloop --http httptools --workers ${COMMAND_MICROSERVICE_WORKERS:-1}
\ No newline at end of file
@@ -0,0 +1,131 @@
+import fakeredis
+import httpx
+import orjson
+import pytest
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.testclient import TestClient
+
+from app.api.routes import CommandRoute
+from app.main import app
+
+TARGET = {"gateway_name": "g", "url": "http://gw1", "target_sensors": ["s1"]}
+
+
+@pytest.fixture
+def forwarded():
+    requests = []
+
+    def gateway(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(202, json={})
+
+    with TestClient(app) as client:
+        # The lifespan's clients are put back before it exits, so they are closed with it
+        http_client, redis_client = app.state.http_client, app.state.redis
+        app.state.http_client = httpx.AsyncClient(transport=httpx.MockTransport(gateway))
+        app.state.redis = fakeredis.FakeAsyncRedis()
+        try:
+            yield client, requests
+        finally:
+            client.portal.call(app.state.http_client.aclose)
+            client.portal.call(app.state.redis.aclose)
+            app.state.http_client, app.state.redis = http_client, redis_client
+
+
+def test_command_is_forwarded(forwarded):
+    client, requests = forwarded
+    response = client.post("/api/v1/sensor/command/set/sensor-state", json={"target": TARGET, "property_value": "idle"})
+
+    assert response.status_code == 202
+    assert str(requests[0].url) == "http://gw1/sensor/command/set/sensor-state"
+    assert requests[0].content == (
+        b'{"method":"set","target":{"gateway_name":"g","url":"http://gw1","target_sensors":["s1"]},'
+        b'"property_name":"sensor-state","property_value":"idle"}'
+    )
+
+
+def test_invalid_command_is_rejected(forwarded):
+    client, requests = forwarded
+    response = client.post("/api/v1/sensor/command/set/sensor-state", json={"target": TARGET, "property_value": "bogus"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "property_value"]
+    assert not requests
+
+
+
+def test_non_json_command_is_rejected(forwarded):
+    client, requests = forwarded
+    response = client.post(
+        "/api/v1/sensor/command/set/sensor-state",
+        content=orjson.dumps({"target": TARGET, "property_value": {}}),
+        headers={"Content-Type": "text/plain"},
+    )
+
+    assert response.status_code == 422
+    assert not requests
+
+
+def test_command_route_rejects_dependencies():
+    async def endpoint(request: Request, command: dict, redis_client=Depends(lambda: None)):
+        pass
+
+    with pytest.raises(AssertionError):
+        APIRouter().add_api_route("/command", endpoint, methods=["POST"], route_class_override=CommandRoute)
+
+def test_command_openapi_documents_body_and_validation_error():
+    operation = app.openapi()["paths"]["/api/v1/sensor/command/set/sensor-state"]["post"]
+
+    assert operation["requestBody"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/SetSensorState"}
+    assert "422" in operation["responses"]
+
+
+def test_retrieve_returns_stored_responses(forwarded):
+    client, _ = forwarded
+    stored = {
+        "metadata": {"sender": "s1", "command_uuid": "c1", "gateway_name": "g"},
+        "property_name": "sensor-state",
+        "property_value": "idle",
+        "method": "get",
+    }
+    client.post("/api/v1/store/sensor/response/get/sensor-state", json=stored)
+
+    response = client.get("/api/v1/retrieve/sensor/response/get/sensor-state", params={"command_uuids": ["c1", "c2"]})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "max-age=1"
+    assert response.json() == [stored]
+
+
+def test_command_fans_out_with_each_target_url(forwarded):
+    client, requests = forwarded
+    target = {"gateway_name": "g", "urls": ["http://gw1", "http://gw2"], "target_sensors": ["s1"]}
+    response = client.post("/api/v1/sensor/command/set/sensor-state", json={"target": target, "property_value": "idle"})
+
+    assert response.status_code == 202
+    forwarded_targets = {str(request.url.host): orjson.loads(request.content)["target"] for request in requests}
+    assert forwarded_targets == {
+        "gw1": {"gateway_name": "g", "url": "http://gw1", "target_sensors": ["s1"]},
+        "gw2": {"gateway_name": "g", "url": "http://gw2", "target_sensors": ["s1"]},
+    }
+
+
+def test_command_is_reencoded_for_the_gateway(forwarded):
+    client, requests = forwarded
+    command = {
+        "junk": "x",
+        "method": "set",
+        "property_name": "inf-latency-bench",
+        "target": {**TARGET, "extra": 1},
+        "property_value": {"sensor_name": "s1", "inference_layer": 0},
+    }
+    response = client.post("/api/v1/sensor/command/set/inf-latency-bench", json=command)
+
+    assert response.status_code == 202
+    assert orjson.loads(requests[0].content) == {
+        "method": "set",
+        "target": TARGET,
+        "property_name": "inf-latency-bench",
+        "property_value": {"sensor_name": "s1", "inference_layer": 0, "send_timestamp": None},
+    }
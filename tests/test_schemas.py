@@ -0,0 +1,25 @@
+import pydantic
+import pytest
+
+from app.api.schemas import gateway_cmd as gw_cmd_schemas
+from app.api.schemas import sensor_cmd as s_cmd_schemas
+
+
+def test_single_url_target():
+    target = gw_cmd_schemas.GatewayAPI(gateway_name="g", url="http://gw1")
+
+    assert target.all_urls == ["http://gw1"]
+    assert target.model_dump() == {"gateway_name": "g", "url": "http://gw1"}
+
+
+def test_urls_target_is_not_serialized():
+    target = s_cmd_schemas.GatewayAPIWithSensors(gateway_name="g", urls=["http://gw1", "http://gw2"], target_sensors=["s1"])
+
+    assert target.all_urls == ["http://gw1", "http://gw2"]
+    assert target.model_dump() == {"gateway_name": "g", "url": None, "target_sensors": ["s1"]}
+
+
+@pytest.mark.parametrize("urls", [{}, {"url": "http://gw1", "urls": ["http://gw2"]}])
+def test_target_requires_exactly_one_of_url_or_urls(urls):
+    with pytest.raises(pydantic.ValidationError):
+        gw_cmd_schemas.GatewayAPI(gateway_name="g", **urls)
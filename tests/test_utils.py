@@ -0,0 +1,93 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.api import utils
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis()
+
+
+def test_retrieve_returns_each_response_once(redis_client):
+    async def scenario():
+        await utils.store_response_in_redis(redis_client, "c1", b'{"v":1}')
+        return await utils.retrieve_responses_from_redis(redis_client, ["c1", "c1"])
+
+    assert asyncio.run(scenario()) == b'[{"v":1}]'
+
+
+def test_retrieve_deletes_responses(redis_client):
+    async def scenario():
+        await utils.store_response_in_redis(redis_client, "c1", b'{"v":1}')
+        first = await utils.retrieve_responses_from_redis(redis_client, ["c1", "c2"])
+        second = await utils.retrieve_responses_from_redis(redis_client, ["c1"])
+        return first, second
+
+    assert asyncio.run(scenario()) == (b'[{"v":1}]', b"[]")
+
+
+def test_retrieve_skips_response_consumed_elsewhere(redis_client):
+    async def scenario():
+        await utils.store_response_in_redis(redis_client, "c1", b'{"v":1}')
+        # Another worker retrieves (and deletes) the response first
+        await redis_client.delete("c1")
+        return await utils.retrieve_responses_from_redis(redis_client, ["c1"])
+
+    assert asyncio.run(scenario()) == b"[]"
+
+
+def test_retrieve_keeps_order_and_decompresses(redis_client):
+    async def scenario():
+        await utils.store_response_in_redis(redis_client, "c1", b'{"v":1}')
+        await utils.store_response_in_redis(redis_client, "c2", b'{"v":"' + b"x" * 2048 + b'"}')
+        return await utils.retrieve_responses_from_redis(redis_client, ["c2", "c3", "c1"])
+
+    assert asyncio.run(scenario()) == b'[{"v":"' + b"x" * 2048 + b'"},{"v":1}]'
+
+
+def test_cancelled_retrieval_does_not_cancel_other_waiters(redis_client, monkeypatch):
+    fetch_and_delete = utils._fetch_and_delete
+
+    async def slow_fetch_and_delete(redis_client, command_uuids):
+        await asyncio.sleep(0.05)
+        return await fetch_and_delete(redis_client, command_uuids)
+
+    monkeypatch.setattr(utils, "_fetch_and_delete", slow_fetch_and_delete)
+
+    async def scenario():
+        await utils.store_response_in_redis(redis_client, "c1", b'{"v":1}')
+        owner = asyncio.create_task(utils.retrieve_responses_from_redis(redis_client, ["c1"]))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(utils.retrieve_responses_from_redis(redis_client, ["c1"]))
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    assert asyncio.run(scenario()) == b'[{"v":1}]'
+    assert not utils._inflight
+
+
+def test_concurrent_retrievals_share_one_lookup(redis_client, monkeypatch):
+    calls = []
+    fetch_and_delete = utils._fetch_and_delete
+
+    async def counting_fetch_and_delete(redis_client, command_uuids):
+        calls.append(command_uuids)
+        return await fetch_and_delete(redis_client, command_uuids)
+
+    monkeypatch.setattr(utils, "_fetch_and_delete", counting_fetch_and_delete)
+
+    async def scenario():
+        await utils.store_response_in_redis(redis_client, "c1", b'{"v":1}')
+        return await asyncio.gather(
+            utils.retrieve_responses_from_redis(redis_client, ["c1"]),
+            utils.retrieve_responses_from_redis(redis_client, ["c1"]),
+        )
+
+    assert asyncio.run(scenario()) == [b'[{"v":1}]', b'[{"v":1}]']
+    assert calls == [["c1"]]